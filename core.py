@@ -0,0 +1,319 @@
+"""YouTube research helpers shared by the Streamlit entry point.
+
+Streamlit re-executes pro_app.py on every rerun but imports this module only
+once per process, so module-level setup and the st.cache_* caches below live
+for the lifetime of the server.
+"""
+import hashlib
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+import requests
+import streamlit as st
+from diskcache import Cache
+from dotenv import load_dotenv
+from psycopg2.pool import ThreadedConnectionPool
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Load environment variables
+load_dotenv()
+api_key = os.getenv("GROQ_API_KEY")
+youtube_api_key = os.getenv("YOUTUBE_API_KEY")
+database_url = os.getenv("DATABASE_URL")
+DEBUG = os.getenv("APP_DEBUG") == "1"  # Set APP_DEBUG=1 to show debugging output in the page
+
+YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+# Point APP_CACHE_DIR at a persistent disk to keep caches across deploys; the default lives in the checkout
+CACHE_DIR = os.getenv("APP_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+
+GROQ_MODEL = "gemma2-9b-it"
+MAX_PROMPT_TOKENS = 6000  # Transcript budget for the summary prompt, leaving room for the answer
+CHARS_PER_TOKEN = 4  # Rough estimate used when the tokenizer is unavailable
+
+# Static page markup, built once at import instead of on every rerun
+HIDE_STREAMLIT_CSS = """
+    <style>
+    #MainMenu, header, footer {visibility: hidden;}
+    [title="Edit source"] {display: none;}
+    </style>
+"""
+LOGOUT_REDIRECT_HTML = '<meta http-equiv="refresh" content="2;url=https://tube-trend.onrender.com">'
+
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session so API calls reuse pooled keep-alive connections across reruns."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_db_pool():
+    """Postgres connection pool shared across reruns, so DB work skips the connect handshake."""
+    return ThreadedConnectionPool(1, 5, database_url)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def search_youtube_topic(topic, region):
+    """Fetch trending YouTube videos for a given topic and region.
+
+    Raises on request failure or an HTTP error status (e.g. quota exhausted)
+    instead of returning an empty list, so failed lookups are never cached;
+    the caller reports the error.
+    """
+    params = {
+        'part': 'snippet', 'q': topic, 'maxResults': 10, 'type': 'video', 'regionCode': region, 'key': youtube_api_key,
+        'fields': 'items(id/videoId,snippet(title,description))',  # Only the keys we read
+    }
+
+    response = get_http_session().get(YOUTUBE_SEARCH_URL, params=params, timeout=10)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+
+    videos = []
+    for item in data.get('items', []):
+        video_id = item['id'].get('videoId')
+        if not video_id:
+            continue
+
+        videos.append({
+            'title': item['snippet']['title'],
+            'video_id': video_id,
+            'video_url': f"https://www.youtube.com/watch?v={video_id}",
+            'description': item['snippet'].get('description', 'No description available.')
+        })
+
+    return videos  # maxResults already bounds the list
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_video_details(video_ids):
+    """Retrieve view counts and full title/description for a batch of YouTube videos in a single request."""
+    params = {
+        'part': 'snippet,statistics', 'id': ','.join(video_ids), 'key': youtube_api_key,
+        'fields': 'items(id,snippet(title,description),statistics/viewCount)',
+    }
+
+    response = get_http_session().get(YOUTUBE_VIDEOS_URL, params=params, timeout=10)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+
+    return {
+        item['id']: {
+            'views': int(item.get('statistics', {}).get('viewCount', 0)),
+            'title': item['snippet']['title'],
+            'description': item['snippet'].get('description') or 'No description available.',
+        }
+        for item in data.get('items', [])
+    }
+
+@st.cache_resource(show_spinner=False)
+def get_transcript_cache():
+    """On-disk transcript store shared by all sessions and worker processes.
+
+    It outlives the in-memory st.cache_data layer only as long as CACHE_DIR
+    does; on an ephemeral filesystem such as Render's, that means until the
+    next deploy or restart unless APP_CACHE_DIR points at a mounted disk.
+    """
+    cache = Cache(os.path.join(CACHE_DIR, 'transcripts'))
+    cache.stats(enable=True)  # Track hits/misses for the session metrics
+    return cache
+
+_NO_TRANSCRIPT = b''  # Disk-cache marker for videos that have no transcript
+
+@st.cache_data(ttl=86400, show_spinner=False)  # In-memory day; the disk cache keeps transcripts for a week
+def get_video_transcript(video_id):
+    """Fetch transcript of a YouTube video, checking the on-disk cache first.
+
+    Videos without captions are remembered for a day; any other failure is
+    raised so it is neither cached nor mistaken for a missing transcript.
+    """
+    # Deferred until the first fetch
+    from youtube_transcript_api import (
+        NoTranscriptAvailable,
+        NoTranscriptFound,
+        TranscriptsDisabled,
+        VideoUnavailable,
+        YouTubeTranscriptApi,
+    )
+
+    cache = get_transcript_cache()
+    compressed = cache.get(video_id)
+    if compressed == _NO_TRANSCRIPT:
+        return "Transcript not available."
+    if compressed is not None:
+        return zlib.decompress(compressed).decode('utf-8')
+
+    try:
+        transcript = YouTubeTranscriptApi.get_transcript(video_id)
+        text = " ".join(t['text'] for t in transcript)
+    except (TranscriptsDisabled, NoTranscriptFound, NoTranscriptAvailable, VideoUnavailable):
+        cache.set(video_id, _NO_TRANSCRIPT, expire=86400)
+        return "Transcript not available."
+
+    cache.set(video_id, zlib.compress(text.encode('utf-8')), expire=604800)  # Transcript text compresses ~4x
+    return text
+
+@st.cache_resource(show_spinner=False)
+def get_tokenizer():
+    """BPE encoder used to budget prompt size; cl100k_base is a close proxy for Gemma's tokenizer."""
+    import tiktoken
+
+    return tiktoken.get_encoding("cl100k_base")
+
+def truncate_to_tokens(text, limit, encoder=None):
+    """Cut text to about `limit` tokens and return it with its token count.
+
+    Without an encoder, tokens are estimated at CHARS_PER_TOKEN characters each.
+    """
+    if encoder is None:
+        text = text[:limit * CHARS_PER_TOKEN]
+        return text, -(-len(text) // CHARS_PER_TOKEN)
+
+    # A token is rarely longer than 8 characters; skip encoding text that cannot fit
+    tokens = encoder.encode(text[:limit * 8], disallowed_special=())[:limit]
+    return encoder.decode(tokens), len(tokens)
+
+def split_budget(sizes, budget):
+    """Split budget across parts of the given sizes, smallest part first.
+
+    Short parts take only what they need, and what they leave over goes to
+    the longer ones. The returned shares line up with `sizes`.
+    """
+    shares = [0] * len(sizes)
+    for served, i in enumerate(sorted(range(len(sizes)), key=sizes.__getitem__)):
+        shares[i] = min(sizes[i], budget // (len(sizes) - served))
+        budget -= shares[i]
+    return shares
+
+def fetch_trending_videos(region='IN', topic=''):
+    """Fetch top 5 trending videos and extract transcripts."""
+    st.write("✅ Fetching Top 5 Videos According to Views & Tags...") 
+    videos = []
+    if not youtube_api_key:
+        st.error("❌ ERROR: YOUTUBE_API_KEY is missing.")
+    else:
+        try:
+            videos = search_youtube_topic(topic, region)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            st.error(f"❌ ERROR: YouTube API request failed - {str(e)}")
+    if not videos:
+        st.warning("⚠️ No videos found. Exiting.")
+        return [], "", ""
+
+    try:
+        details = get_video_details([video['video_id'] for video in videos])
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        st.error(f"❌ ERROR: Failed to fetch views - {str(e)}")
+        details = {}
+    for video in videos:
+        video.update(details.get(video['video_id'], {'views': 0}))  # videos.list snippets are untruncated
+
+    # Rank every search hit by views first, so transcripts are only fetched for the real top 5
+    videos.sort(key=lambda x: x['views'], reverse=True)
+    top_videos = videos[:5]
+
+    with ThreadPoolExecutor(max_workers=len(top_videos)) as executor:
+        transcripts = [executor.submit(get_video_transcript, video['video_id']) for video in top_videos]
+        for video, future in zip(top_videos, transcripts):
+            try:
+                transcript = future.result()
+            except Exception as e:  # Not cached, so the next fetch retries it
+                # The library's messages run to several paragraphs; keep the page short
+                st.warning(f"⚠️ Transcript fetch failed for {video['title']}: {type(e).__name__}")
+                if DEBUG:
+                    st.write(f"DEBUG: {e}")  # Debugging output
+                transcript = "Transcript not available."
+            if transcript == "Transcript not available.":
+                transcript = video['description']  # Use description as fallback
+            video['content'] = transcript
+
+    hits, misses = get_transcript_cache().stats()
+    st.session_state['transcript_cache_stats'] = {'hits': hits, 'misses': misses}
+
+    try:
+        encoder = get_tokenizer()
+    except Exception:  # BPE table download failed; fall back to the character estimate
+        encoder = None
+    # Measure every part (no part can use more than the whole budget), then
+    # split the budget so short description fallbacks don't cap long transcripts
+    measured = [
+        truncate_to_tokens(f"### {video['title']} ({video['views']} views)\n{video['content']}\n\n", MAX_PROMPT_TOKENS, encoder)
+        for video in top_videos
+    ]
+    shares = split_budget([size for _, size in measured], MAX_PROMPT_TOKENS)
+    content_parts = [
+        text if share == size else truncate_to_tokens(text, share, encoder)[0]
+        for (text, size), share in zip(measured, shares)
+    ]
+    title_parts = [video['title'] for video in top_videos]
+
+    return top_videos, "".join(content_parts), ", ".join(title_parts)
+
+@st.cache_resource
+def get_llm():
+    """Groq chat client shared across reruns so its HTTP connection pool is reused."""
+    from langchain_groq import ChatGroq  # LangChain's import tree is heavy; load it on first use
+
+    return ChatGroq(model=GROQ_MODEL, streaming=True)
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    """On-disk store of finished LLM answers, keyed by model and normalized prompt."""
+    return Cache(os.path.join(CACHE_DIR, 'responses'))
+
+def stream_completion(prompt):
+    """Stream the LLM answer to prompt into the page, replaying a cached answer for a repeated prompt."""
+    cache = get_response_cache()
+    # Whitespace is collapsed but case kept, so "US" and "us" stay distinct prompts
+    normalized = " ".join(prompt.split())
+    key = hashlib.sha256(f"{GROQ_MODEL}\n{normalized}".encode('utf-8')).hexdigest()
+    response = cache.get(key)
+    if response is not None:
+        st.write(response)
+        return response
+
+    response = st.write_stream(chunk.content for chunk in get_llm().stream(prompt))
+    if response:
+        cache.set(key, response, expire=86400)
+    return response
+
+def generate_summary(all_content, titles):
+    """Stream an AI-powered summary of the video content into the page.
+
+    Returns the summary text, or None if generation failed.
+    """
+    if not all_content.strip():
+        st.warning("⚠️ No transcripts found. Using only titles for AI generation.")
+        prompt = f"Generate an engaging article using these video titles: {titles}."
+    else:
+        prompt = f"Write a high-quality summary for these videos: {titles}.\n\n{all_content}"
+
+    try:
+        response = stream_completion(prompt)
+    except Exception as e:
+        st.error(f"\n❌ ERROR: AI Model Call Failed - {str(e)}")
+        st.write("⚠️ AI content generation failed. Please try again.")
+        return None
+    if not response:
+        st.write("⚠️ AI content generation failed.")
+        return None
+    return response
+
+def ai_research_chat(query):
+    """AI chatbot that streams an answer and related topics into the page and returns its text."""
+    try:
+        prompt = f"Answer this question and suggest related questions: {query}"
+        return stream_completion(prompt)
+    except Exception as e:
+        response = f"❌ ERROR: Failed to generate chatbot response - {str(e)}"
+        st.write(response)
+        return response
@@ -0,0 +1,27 @@
+from core import CHARS_PER_TOKEN, MAX_PROMPT_TOKENS, split_budget, truncate_to_tokens
+
+
+def test_split_budget_gives_leftover_to_long_parts():
+    assert split_budget([6000, 9, 9, 9, 9], 6000) == [5964, 9, 9, 9, 9]
+
+
+def test_split_budget_shares_evenly_when_every_part_is_long():
+    assert split_budget([5000, 5000, 5000], 6000) == [2000, 2000, 2000]
+
+
+def test_split_budget_never_exceeds_budget():
+    shares = split_budget([7000, 3000, 1500, 40, 900], 6000)
+    assert sum(shares) <= 6000
+    assert shares[3] == 40
+
+
+def test_long_transcript_keeps_budget_left_by_description_fallbacks():
+    # One captioned video and four short description fallbacks, budgeted without tiktoken
+    parts = ["x" * 100_000] + ["short description fallback text ..."] * 4
+    measured = [truncate_to_tokens(part, MAX_PROMPT_TOKENS) for part in parts]
+    shares = split_budget([size for _, size in measured], MAX_PROMPT_TOKENS)
+    texts = [truncate_to_tokens(text, share)[0] for (text, _), share in zip(measured, shares)]
+
+    assert texts[1:] == parts[1:]
+    assert sum(shares) == MAX_PROMPT_TOKENS
+    assert len(texts[0]) == shares[0] * CHARS_PER_TOKEN